@@ -4,12 +4,12 @@ from typing import Optional
 
 # === Statements ===
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AdoptStatement:
     """adopt io  /  adopt localdir.localfile"""
-    module_path: list[str]  # e.g. ['localdir', 'localfile']
+    module_path: tuple[str, ...]  # e.g. ('localdir', 'localfile')
 
-@dataclass
+@dataclass(slots=True)
 class VariableDecl:
     """[share] keep name [: type] [= expr]"""
     name: str
@@ -17,149 +17,200 @@ class VariableDecl:
     is_shared: bool = False
     type_ann: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Assignment:
     """target op= value"""
     target: 'Expr'
     op: str  # '=', '+=', '-=', '*=', '/='
     value: 'Expr'
 
-@dataclass
+@dataclass(slots=True)
 class IfStatement:
     condition: 'Expr'
     body: 'Block'
     elif_clauses: list[tuple['Expr', 'Block']] = field(default_factory=list)
     else_body: 'Optional[Block]' = None
 
-@dataclass
+@dataclass(slots=True)
 class WhileStatement:
     """stay condition { body }"""
     condition: 'Expr'
     body: 'Block'
 
-@dataclass
+@dataclass(slots=True)
 class ForEachStatement:
     """go iterable by var { body }"""
     iterable: 'Expr'
     var_name: str
     body: 'Block'
 
-@dataclass
+@dataclass(slots=True)
 class ReturnStatement:
     value: 'Optional[Expr]' = None
 
-@dataclass
+@dataclass(slots=True)
 class ExpressionStatement:
     """Wrapper for an expression used as a statement."""
     expr: 'Expr'
 
-@dataclass
+@dataclass(slots=True)
 class Block:
     statements: list
 
 # === Expressions ===
 
-@dataclass
-class NumberLiteral:
-    value: object  # int or float
+class _HotNode:
+    """Base for the most frequently built expression nodes. These use a
+    hand-written __init__ instead of @dataclass to keep construction cheap;
+    only a dataclass-style __repr__ is provided."""
+    __slots__ = ()
 
-@dataclass
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+@dataclass(frozen=True, slots=True)
+class IntLiteral:
+    value: int
+
+@dataclass(frozen=True, slots=True)
+class FloatLiteral:
+    value: float
+
+NumberLiteral = IntLiteral | FloatLiteral
+
+@dataclass(frozen=True, slots=True)
 class StringLiteral:
     value: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BoolLiteral:
     value: bool
 
-@dataclass
+@dataclass(slots=True)
 class ArrayLiteral:
     elements: list['Expr']
 
-@dataclass
-class Identifier:
-    name: str
+class Identifier(_HotNode):
+    __slots__ = ('name',)
+    __match_args__ = ('name',)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
 
-@dataclass
-class BinaryOp:
-    left: 'Expr'
-    op: str
-    right: 'Expr'
+class BinaryOp(_HotNode):
+    __slots__ = ('left', 'op', 'right')
+    __match_args__ = ('left', 'op', 'right')
 
-@dataclass
-class UnaryOp:
-    op: str  # '!' or '-'
-    operand: 'Expr'
+    def __init__(self, left: 'Expr', op: str, right: 'Expr') -> None:
+        self.left = left
+        self.op = op
+        self.right = right
 
-@dataclass
-class MemberAccess:
+class UnaryOp(_HotNode):
+    __slots__ = ('op', 'operand')
+    __match_args__ = ('op', 'operand')
+
+    def __init__(self, op: str, operand: 'Expr') -> None:
+        self.op = op  # '!' or '-'
+        self.operand = operand
+
+class MemberAccess(_HotNode):
     """object.member"""
-    object: 'Expr'
-    member: str
+    __slots__ = ('object', 'member')
+    __match_args__ = ('object', 'member')
+
+    def __init__(self, object: 'Expr', member: str) -> None:
+        self.object = object
+        self.member = member
 
-@dataclass
+@dataclass(slots=True)
 class ModuleAccess:
     """module::member"""
     object: 'Expr'
     member: str
 
-@dataclass
-class IndexAccess:
+class IndexAccess(_HotNode):
     """object[index]"""
-    object: 'Expr'
-    index: 'Expr'
+    __slots__ = ('object', 'index')
+    __match_args__ = ('object', 'index')
 
-@dataclass
-class FunctionCall:
-    callee: 'Expr'
-    args: list['Expr']
+    def __init__(self, object: 'Expr', index: 'Expr') -> None:
+        self.object = object
+        self.index = index
+
+class FunctionCall(_HotNode):
+    __slots__ = ('callee', 'args')
+    __match_args__ = ('callee', 'args')
+
+    def __init__(self, callee: 'Expr', args: list['Expr']) -> None:
+        self.callee = callee
+        self.args = args
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Param:
     name: str
     type_ann: Optional[str] = None
     is_vararg: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class Closure:
     """(params) => { body }  or  (params) => expr"""
     params: list[Param]
     body: 'Block'
 
-@dataclass
+@dataclass(slots=True)
 class RangeExpr:
     """start to end"""
     start: 'Expr'
     end: 'Expr'
 
-@dataclass
+@dataclass(slots=True)
 class MakeoutExpr:
     """makeout ClassName(args)  or  makeout mod::Class(args)"""
     callee: 'Expr'
     args: list['Expr']
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NativeBlock:
     """native => { raw JS code }"""
     code: str
 
-@dataclass
+@dataclass(slots=True)
 class ClassDef:
     """boy [: parent] { members }"""
     name: str  # set by the enclosing VariableDecl
     parent: Optional[str]
     members: list  # list of VariableDecl
 
-@dataclass
+@dataclass(slots=True)
 class Module:
     path: str  # dotted path or filename
     statements: list
     source_dir: str = ""  # directory of the source file
 
-@dataclass
+@dataclass(slots=True)
 class Program:
     modules: list[Module]
 
 
+# === Shared leaf nodes ===
+# Literal leaves are frozen, so the parser can hand out one instance for
+# every occurrence of the same value.
+
+_TRUE = BoolLiteral(True)
+_FALSE = BoolLiteral(False)
+_SMALL_INTS = [IntLiteral(i) for i in range(257)]
+
+def make_bool(value: bool) -> BoolLiteral:
+    return _TRUE if value else _FALSE
+
+def make_int(value: int) -> IntLiteral:
+    if 0 <= value < len(_SMALL_INTS):
+        return _SMALL_INTS[value]
+    return IntLiteral(value)
+
+
 # Union type alias for documentation
 Expr = (NumberLiteral | StringLiteral | BoolLiteral | ArrayLiteral |
         Identifier | BinaryOp | UnaryOp | MemberAccess | ModuleAccess |
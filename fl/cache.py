@@ -0,0 +1,122 @@
+# On-disk cache of the JS generated for each module, used by flc.
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+from fl.ast_nodes import AdoptStatement, Module
+
+
+_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'flc',
+)
+
+# Entries kept on disk; the least recently used beyond this are deleted
+_CACHE_MAX_ENTRIES = 512
+
+
+@lru_cache(maxsize=None)
+def _compiler_tag() -> str:
+    """Hash of the compiler's own sources, so edits to it invalidate the cache."""
+    pkg_dir = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256()
+    for name in sorted(os.listdir(pkg_dir)):
+        if name.endswith('.py'):
+            with open(os.path.join(pkg_dir, name), 'rb') as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+def _valid_entry(entry) -> bool:
+    """Whether a decoded cache file has the shape store() writes."""
+    if not isinstance(entry, dict) or not isinstance(entry.get('js'), str):
+        return False
+    adopts = entry.get('adopts')
+    return isinstance(adopts, list) and all(
+        isinstance(path, list) and path and all(isinstance(part, str) for part in path)
+        for path in adopts
+    )
+
+
+class ModuleCache:
+    """
+    Generated JS per module, stored on disk under a hash of the compiler,
+    the module's dotted path and its source. A hit also records the module's
+    adopt list, which is all discovery needs, so the file is not parsed.
+    """
+    def __init__(self, directory: str = _CACHE_DIR,
+                 max_entries: int = _CACHE_MAX_ENTRIES) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self.tag = _compiler_tag()
+        self.hits: dict[str, str] = {}   # dotted path -> cached JS
+        self.keys: dict[str, str] = {}   # dotted path -> key, for misses
+
+    def _key(self, dotted_path: str, source: str) -> str:
+        h = hashlib.sha256(self.tag.encode())
+        h.update(b'\0' + dotted_path.encode('utf-8') + b'\0')
+        h.update(source.encode('utf-8'))
+        return h.hexdigest()
+
+    def lookup(self, dotted_path: str, source: str) -> list | None:
+        """Return the module's adopt statements on a hit, None on a miss."""
+        key = self._key(dotted_path, source)
+        path = os.path.join(self.directory, key + '.json')
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+        if not _valid_entry(entry):
+            self.keys[dotted_path] = key
+            return None
+        adopts, js = entry['adopts'], entry['js']
+        # The mtime marks the last use, for prune()
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits[dotted_path] = js
+        return [AdoptStatement(module_path=tuple(path)) for path in adopts]
+
+    def store(self, module: Module, js: str):
+        """Save the JS generated for a module that missed in lookup()."""
+        key = self.keys.get(module.path)
+        if key is None:
+            return
+        entry = {
+            'adopts': [stmt.module_path for stmt in module.statements
+                       if isinstance(stmt, AdoptStatement)],
+            'js': js,
+        }
+        path = os.path.join(self.directory, key + '.json')
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        # The cache is only an accelerator; failing to write it is not an error
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def prune(self):
+        """Delete the least recently used entries beyond max_entries."""
+        try:
+            with os.scandir(self.directory) as it:
+                entries = [(e.stat().st_mtime, e.path) for e in it if e.name.endswith('.json')]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
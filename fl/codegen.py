@@ -1,3 +1,5 @@
+from typing import Iterator
+
 from fl.ast_nodes import (
     AdoptStatement, VariableDecl, Assignment, IfStatement, WhileStatement,
     ForEachStatement, ReturnStatement, ExpressionStatement, Block,
@@ -23,6 +25,8 @@ class CodeGen:
         self.in_class: str | None = None
         self.class_private_members: set[str] = set()
         self.class_shared_members: set[str] = set()
+        # JS already generated for a module in an earlier run, by dotted path
+        self.precompiled: dict[str, str] = {}
 
     def indent(self) -> str:
         return self.indent_str * self.indent_level
@@ -37,9 +41,14 @@ class CodeGen:
 
     def generate_program(self, program: Program) -> str:
         """Generate JS for an entire program (multiple modules bundled)."""
-        lines = []
-        lines.append("// Generated by Femboy Language Compiler")
-        lines.append("")
+        return "".join(self.generate_program_iter(program))
+
+    def generate_program_iter(self, program: Program) -> Iterator[str]:
+        """Generate JS for an entire program piece by piece, one module at a time.
+
+        Joining the pieces gives exactly the text of generate_program().
+        """
+        yield "// Generated by Femboy Language Compiler\n"
 
         # Collect all stdlib usage across modules
         for module in program.modules:
@@ -51,9 +60,10 @@ class CodeGen:
         for mod_name in sorted(self.stdlib_used):
             js = get_stdlib_js(mod_name)
             if js:
-                lines.append(js)
+                yield "\n"
+                yield js
         if self.stdlib_used:
-            lines.append("")
+            yield "\n"
 
         # Emit non-main modules as IIFEs
         main_module = None
@@ -61,18 +71,30 @@ class CodeGen:
             if module.path == "__main__":
                 main_module = module
             else:
-                lines.append(self._generate_module_iife(module))
-                lines.append("")
+                yield "\n"
+                yield self.generate_bundled_module(module)
+                yield "\n"
 
         # Build module namespace objects for the entry module
         if main_module:
-            # Emit entry module (not a module IIFE — no __exports)
-            gen = CodeGen()
-            gen.stdlib_used = self.stdlib_used
-            code = gen._generate_module_body(main_module, is_entry=False)
-            lines.append(code)
-
-        return "\n".join(lines)
+            yield "\n"
+            yield self.generate_bundled_module(main_module)
+
+    def add_precompiled(self, path: str, js: str):
+        """Use ready-made JS for the module at `path` instead of generating it."""
+        self.precompiled[path] = js
+
+    def generate_bundled_module(self, module: Module) -> str:
+        """Generate the JS a module contributes to a program bundle."""
+        js = self.precompiled.get(module.path)
+        if js is not None:
+            return js
+        if module.path != "__main__":
+            return self._generate_module_iife(module)
+        # Emit entry module (not a module IIFE — no __exports)
+        gen = CodeGen()
+        gen.stdlib_used = self.stdlib_used
+        return gen._generate_module_body(module, is_entry=False)
 
     def generate_module(self, module: Module) -> str:
         """Generate JS for a single module (entry point)."""
@@ -1,283 +1,212 @@
-from fl.tokens import Token, TokenType, KEYWORDS
+import re
+import sys
+from typing import Final, Iterator, NoReturn
+
+from itertools import repeat
+
+from fl.tokens import Token, TokenType, KEYWORDS, OPERATORS, line_col
+
+
+# Leading blanks are consumed by the same match as the token that follows
+# them. Strings without escapes are matched whole; any other string only
+# matches its opening quote and is handed to Lexer.read_string, which deals
+# with escapes and error positions.
+_TOKEN_RE: Final = re.compile(r"""
+    [ \t\r]*
+    (?:
+        (?P<NEWLINE>\n)
+      | (?P<COMMENT>\#[^\n]*)
+      | (?P<STRING>"[^"\\\n]*")
+      | (?P<ESCAPED_STRING>")
+      | (?P<FLOAT>\d+\.\d+)
+      | (?P<INT>\d+)
+      | (?P<IDENT>[^\W\d]\w*)
+      | (?P<OP>\+=|-=|\*=|/=|==|!=|<=|>=|=>|::|\.\.\.|&&|\|\||[-+*/%=!<>:.(){}\[\],])
+    )
+""", re.VERBOSE)
+_WS_RE: Final = re.compile(r'[ \t\r]*')
+_STRING_STOP_RE: Final = re.compile(r'["\\\n]')
+# Unknown escapes are kept as written, backslash included
+_ESCAPES: Final[dict[str, str]] = {
+    'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', '"': '"', '0': '\0',
+}
+_BRACE_RE: Final = re.compile(r'[{}]')
+_NEWLINE_RE: Final = re.compile(r'\n')
 
 
 class LexerError(Exception):
-    def __init__(self, message: str, line: int, col: int):
+    def __init__(self, message: str, line: int, col: int) -> None:
         super().__init__(f"Lexer error at {line}:{col}: {message}")
         self.line = line
         self.col = col
 
 
 class Lexer:
-    def __init__(self, source: str, filename: str = "<stdin>"):
-        self.source = source
-        self.filename = filename
-        self.pos = 0
-        self.line = 1
-        self.col = 1
+    def __init__(self, source: str, filename: str = "<stdin>") -> None:
+        # The trailing NUL is a sentinel so scanners can index one past the
+        # last character without a bounds check; _end marks the real end.
+        self.source: str = source + '\0'
+        self._end: int = len(source)
+        self.filename: str = filename
+        self.pos: int = 0
+        self.line: int = 1
+        self.col: int = 1
         self.tokens: list[Token] = []
-
-    def error(self, msg: str):
+        # Source offset at which each line begins
+        self.line_starts: list[int] = [0]
+        # Token stream as parallel arrays, filled by scan()
+        self.types: tuple[TokenType, ...] = ()
+        self.values: tuple = ()
+        self.positions: tuple[int, ...] = ()
+
+    def error(self, msg: str) -> NoReturn:
         raise LexerError(msg, self.line, self.col)
 
-    def peek(self, offset: int = 0) -> str:
-        p = self.pos + offset
-        if p < len(self.source):
-            return self.source[p]
-        return '\0'
-
     def advance(self) -> str:
         ch = self.source[self.pos]
         self.pos += 1
         if ch == '\n':
             self.line += 1
             self.col = 1
+            self.line_starts.append(self.pos)
         else:
             self.col += 1
         return ch
 
-    def match(self, expected: str) -> bool:
-        if self.pos < len(self.source) and self.source[self.pos] == expected:
-            self.advance()
-            return True
-        return False
-
-    def make_token(self, type: TokenType, value, line: int, col: int, pos: int) -> Token:
-        return Token(type, value, line, col, pos)
-
-    def skip_whitespace(self):
-        while self.pos < len(self.source) and self.source[self.pos] in (' ', '\t', '\r'):
-            self.advance()
-
-    def skip_comment(self):
-        while self.pos < len(self.source) and self.source[self.pos] != '\n':
-            self.advance()
-
-    def read_string(self) -> Token:
-        line, col, pos = self.line, self.col, self.pos
+    def read_string(self) -> tuple[TokenType, str, int]:
+        pos = self.pos
         self.advance()  # skip opening "
+        source = self.source
         result = []
-        while self.pos < len(self.source):
-            ch = self.source[self.pos]
+        while True:
+            # Copy the run up to the next quote, backslash or newline in one go
+            start = self.pos
+            m = _STRING_STOP_RE.search(source, start)
+            stop = m.start() if m else self._end
+            if stop > start:
+                result.append(source[start:stop])
+                self.col += stop - start
+                self.pos = stop
+            ch = source[stop]
             if ch == '"':
                 self.advance()
-                return self.make_token(TokenType.STRING, ''.join(result), line, col, pos)
+                return (TokenType.STRING, ''.join(result), pos)
             if ch == '\\':
                 self.advance()
-                if self.pos >= len(self.source):
+                if self.pos == self._end:
                     self.error("Unterminated string escape")
                 esc = self.advance()
-                if esc == 'n':
-                    result.append('\n')
-                elif esc == 't':
-                    result.append('\t')
-                elif esc == 'r':
-                    result.append('\r')
-                elif esc == '\\':
-                    result.append('\\')
-                elif esc == '"':
-                    result.append('"')
-                elif esc == '0':
-                    result.append('\0')
-                else:
-                    result.append('\\')
-                    result.append(esc)
-            elif ch == '\n':
-                self.error("Unterminated string literal")
+                result.append(_ESCAPES.get(esc) or '\\' + esc)
             else:
-                result.append(self.advance())
-        self.error("Unterminated string literal")
+                # Newline, or the sentinel at the end of the source
+                self.error("Unterminated string literal")
 
-    def read_number(self) -> Token:
-        line, col, pos = self.line, self.col, self.pos
-        start = self.pos
-        is_float = False
-        while self.pos < len(self.source) and self.source[self.pos].isdigit():
-            self.advance()
-        if self.pos < len(self.source) and self.source[self.pos] == '.':
-            next_ch = self.peek(1)
-            if next_ch.isdigit():
-                is_float = True
-                self.advance()  # skip .
-                while self.pos < len(self.source) and self.source[self.pos].isdigit():
-                    self.advance()
-        text = self.source[start:self.pos]
-        if is_float:
-            return self.make_token(TokenType.FLOAT, float(text), line, col, pos)
+    def skip_to(self, end: int) -> None:
+        """Move to source offset `end`, updating line/col in bulk."""
+        nl = self.source.count('\n', self.pos, end)
+        if nl:
+            self.line += nl
+            self.col = end - self.source.rfind('\n', self.pos, end)
+            self.line_starts.extend(m.end() for m in _NEWLINE_RE.finditer(self.source, self.pos, end))
         else:
-            return self.make_token(TokenType.INT, int(text), line, col, pos)
-
-    def read_identifier(self) -> Token:
-        line, col, pos = self.line, self.col, self.pos
-        start = self.pos
-        while self.pos < len(self.source) and (self.source[self.pos].isalnum() or self.source[self.pos] == '_'):
-            self.advance()
-        text = self.source[start:self.pos]
-        token_type = KEYWORDS.get(text, TokenType.IDENT)
-        return self.make_token(token_type, text, line, col, pos)
+            self.col += end - self.pos
+        self.pos = end
 
     def extract_raw_block(self) -> str:
         """Extract raw text inside { } for native blocks, tracking nesting."""
         depth = 1
         start = self.pos
-        while self.pos < len(self.source) and depth > 0:
-            ch = self.source[self.pos]
-            if ch == '{':
+        for m in _BRACE_RE.finditer(self.source, start, self._end):
+            if m.group() == '{':
                 depth += 1
-            elif ch == '}':
-                depth -= 1
-                if depth == 0:
-                    raw = self.source[start:self.pos]
-                    self.advance()  # skip closing }
-                    return raw
-            if ch == '\n':
-                self.line += 1
-                self.col = 1
-            else:
-                self.col += 1
-            self.pos += 1
+                continue
+            depth -= 1
+            if depth == 0:
+                end = m.start()
+                self.skip_to(end)
+                self.advance()  # skip closing }
+                return self.source[start:end]
+        self.skip_to(self._end)
         self.error("Unterminated native block")
 
     def tokenize(self) -> list[Token]:
-        tokens = []
-        while self.pos < len(self.source):
-            self.skip_whitespace()
-            if self.pos >= len(self.source):
-                break
-
-            ch = self.source[self.pos]
-            line, col, pos = self.line, self.col, self.pos
-
-            # Newline
-            if ch == '\n':
-                self.advance()
-                tokens.append(self.make_token(TokenType.NEWLINE, '\\n', line, col, pos))
-                continue
-
-            # Comment
-            if ch == '#':
-                self.skip_comment()
-                continue
-
-            # String
-            if ch == '"':
-                tokens.append(self.read_string())
-                continue
+        self.scan()
+        self.tokens = list(map(Token, self.types, self.values, self.positions,
+                               repeat(self.line_starts)))
+        return self.tokens
+
+    def scan(self) -> None:
+        """Lex the source into the parallel types/values/positions arrays
+        without allocating a Token per token. Line and column numbers are
+        not stored per token; see line_col()."""
+        self.types, self.values, self.positions = zip(*self._rows())
+
+    def iter_tokens(self) -> Iterator[Token]:
+        """Yield tokens one at a time as the source is lexed, without
+        building the token list or the parallel arrays."""
+        line_starts = self.line_starts
+        for type, value, pos in self._rows():
+            yield Token(type, value, pos, line_starts)
+
+    def _rows(self) -> Iterator[tuple[TokenType, object, int]]:
+        """Generate (type, value, pos) for each token, ending with EOF."""
+        new_line = self.line_starts.append
+        match = _TOKEN_RE.match
+        keyword = KEYWORDS.get
+        intern = sys.intern
+        source = self.source
+        end_of_source = self._end
+        pos = self.pos
+        while pos < end_of_source:
+            m = match(source, pos, end_of_source)
+            if m is None:
+                # Trailing blanks, or blanks followed by a bad character
+                pos = _WS_RE.match(source, pos, end_of_source).end()
+                if pos == end_of_source:
+                    break
+                self._sync(pos)
+                ch = source[pos]
+                if ch == '&' or ch == '|':
+                    self.advance()
+                    self.error(f"Unexpected character '{ch}', did you mean '{ch}{ch}'?")
+                self.error(f"Unexpected character: {ch!r}")
 
-            # Number
-            if ch.isdigit():
-                tokens.append(self.read_number())
-                continue
+            kind = m.lastgroup
+            start = m.start(kind)
 
-            # Identifier / keyword
-            if ch.isalpha() or ch == '_':
-                tokens.append(self.read_identifier())
+            if kind == 'ESCAPED_STRING':
+                self._sync(start)
+                yield self.read_string()
+                pos = self.pos
                 continue
 
-            # Operators and delimiters
-            if ch == '+':
-                self.advance()
-                if self.match('='):
-                    tokens.append(self.make_token(TokenType.PLUS_ASSIGN, '+=', line, col, pos))
-                else:
-                    tokens.append(self.make_token(TokenType.PLUS, '+', line, col, pos))
-            elif ch == '-':
-                self.advance()
-                if self.match('='):
-                    tokens.append(self.make_token(TokenType.MINUS_ASSIGN, '-=', line, col, pos))
-                else:
-                    tokens.append(self.make_token(TokenType.MINUS, '-', line, col, pos))
-            elif ch == '*':
-                self.advance()
-                if self.match('='):
-                    tokens.append(self.make_token(TokenType.STAR_ASSIGN, '*=', line, col, pos))
-                else:
-                    tokens.append(self.make_token(TokenType.STAR, '*', line, col, pos))
-            elif ch == '/':
-                self.advance()
-                if self.match('='):
-                    tokens.append(self.make_token(TokenType.SLASH_ASSIGN, '/=', line, col, pos))
-                else:
-                    tokens.append(self.make_token(TokenType.SLASH, '/', line, col, pos))
-            elif ch == '%':
-                self.advance()
-                tokens.append(self.make_token(TokenType.PERCENT, '%', line, col, pos))
-            elif ch == '=':
-                self.advance()
-                if self.match('='):
-                    tokens.append(self.make_token(TokenType.EQ, '==', line, col, pos))
-                elif self.match('>'):
-                    tokens.append(self.make_token(TokenType.ARROW, '=>', line, col, pos))
-                else:
-                    tokens.append(self.make_token(TokenType.ASSIGN, '=', line, col, pos))
-            elif ch == '!':
-                self.advance()
-                if self.match('='):
-                    tokens.append(self.make_token(TokenType.NEQ, '!=', line, col, pos))
-                else:
-                    tokens.append(self.make_token(TokenType.BANG, '!', line, col, pos))
-            elif ch == '<':
-                self.advance()
-                if self.match('='):
-                    tokens.append(self.make_token(TokenType.LTE, '<=', line, col, pos))
-                else:
-                    tokens.append(self.make_token(TokenType.LT, '<', line, col, pos))
-            elif ch == '>':
-                self.advance()
-                if self.match('='):
-                    tokens.append(self.make_token(TokenType.GTE, '>=', line, col, pos))
-                else:
-                    tokens.append(self.make_token(TokenType.GT, '>', line, col, pos))
-            elif ch == '&':
-                self.advance()
-                if self.match('&'):
-                    tokens.append(self.make_token(TokenType.AND, '&&', line, col, pos))
-                else:
-                    self.error(f"Unexpected character '&', did you mean '&&'?")
-            elif ch == '|':
-                self.advance()
-                if self.match('|'):
-                    tokens.append(self.make_token(TokenType.OR, '||', line, col, pos))
-                else:
-                    self.error(f"Unexpected character '|', did you mean '||'?")
-            elif ch == ':':
-                self.advance()
-                if self.match(':'):
-                    tokens.append(self.make_token(TokenType.COLONCOLON, '::', line, col, pos))
-                else:
-                    tokens.append(self.make_token(TokenType.COLON, ':', line, col, pos))
-            elif ch == '.':
-                self.advance()
-                if self.peek() == '.' and self.peek(1) == '.':
-                    self.advance()
-                    self.advance()
-                    tokens.append(self.make_token(TokenType.DOTDOTDOT, '...', line, col, pos))
-                else:
-                    tokens.append(self.make_token(TokenType.DOT, '.', line, col, pos))
-            elif ch == '(':
-                self.advance()
-                tokens.append(self.make_token(TokenType.LPAREN, '(', line, col, pos))
-            elif ch == ')':
-                self.advance()
-                tokens.append(self.make_token(TokenType.RPAREN, ')', line, col, pos))
-            elif ch == '{':
-                self.advance()
-                tokens.append(self.make_token(TokenType.LBRACE, '{', line, col, pos))
-            elif ch == '}':
-                self.advance()
-                tokens.append(self.make_token(TokenType.RBRACE, '}', line, col, pos))
-            elif ch == '[':
-                self.advance()
-                tokens.append(self.make_token(TokenType.LBRACKET, '[', line, col, pos))
-            elif ch == ']':
-                self.advance()
-                tokens.append(self.make_token(TokenType.RBRACKET, ']', line, col, pos))
-            elif ch == ',':
-                self.advance()
-                tokens.append(self.make_token(TokenType.COMMA, ',', line, col, pos))
-            else:
-                self.error(f"Unexpected character: {ch!r}")
-
-        tokens.append(self.make_token(TokenType.EOF, None, self.line, self.col, self.pos))
-        self.tokens = tokens
-        return tokens
+            pos = m.end()
+            if kind == 'NEWLINE':
+                yield (TokenType.NEWLINE, '\\n', start)
+                new_line(pos)
+            elif kind == 'IDENT':
+                # Interned so later name comparisons are pointer compares
+                text = intern(source[start:pos])
+                yield (keyword(text, TokenType.IDENT), text, start)
+            elif kind == 'OP':
+                text = source[start:pos]
+                yield (OPERATORS[text], text, start)
+            elif kind == 'STRING':
+                yield (TokenType.STRING, source[start + 1:pos - 1], start)
+            elif kind == 'INT':
+                yield (TokenType.INT, int(source[start:pos]), start)
+            elif kind == 'FLOAT':
+                yield (TokenType.FLOAT, float(source[start:pos]), start)
+            # Comments produce no tokens
+
+        self._sync(pos)
+        yield (TokenType.EOF, None, pos)
+
+    def _sync(self, pos: int) -> None:
+        """Move to `pos`, which must not be before the current line start."""
+        self.pos = pos
+        self.line = len(self.line_starts)
+        self.col = pos - self.line_starts[-1] + 1
+
+    def line_col(self, pos: int) -> tuple[int, int]:
+        return line_col(self.line_starts, pos)
@@ -1,113 +1,191 @@
+import re
+from bisect import bisect_left
+from typing import Callable, Final
+
 from fl.tokens import Token, TokenType
 from fl.lexer import Lexer
 from fl.ast_nodes import (
     AdoptStatement, VariableDecl, Assignment, IfStatement, WhileStatement,
     ForEachStatement, ReturnStatement, ExpressionStatement, Block,
-    NumberLiteral, StringLiteral, BoolLiteral, ArrayLiteral, Identifier,
-    BinaryOp, UnaryOp, MemberAccess, ModuleAccess, IndexAccess,
+    IntLiteral, FloatLiteral, StringLiteral, BoolLiteral, ArrayLiteral,
+    Identifier, BinaryOp, UnaryOp, MemberAccess, ModuleAccess, IndexAccess,
     FunctionCall, Closure, Param, RangeExpr, MakeoutExpr, NativeBlock,
-    ClassDef, Module,
+    ClassDef, Module, make_bool, make_int,
+)
+
+
+_ASSIGN_OPS: Final = frozenset({TokenType.ASSIGN, TokenType.PLUS_ASSIGN, TokenType.MINUS_ASSIGN,
+                                TokenType.STAR_ASSIGN, TokenType.SLASH_ASSIGN})
+_EQ_OPS: Final = frozenset({TokenType.EQ, TokenType.NEQ})
+_CMP_OPS: Final = frozenset({TokenType.LT, TokenType.GT, TokenType.LTE, TokenType.GTE})
+_ADD_OPS: Final = frozenset({TokenType.PLUS, TokenType.MINUS})
+_MUL_OPS: Final = frozenset({TokenType.STAR, TokenType.SLASH, TokenType.PERCENT})
+_STMT_END: Final = frozenset({TokenType.NEWLINE, TokenType.EOF, TokenType.RBRACE})
+_UNARY_PREFIX: Final = frozenset({TokenType.BANG, TokenType.MINUS})
+
+# Binary operator levels from loosest to tightest binding: the operator types
+# at each level and the JS spelling to emit (None means the token's own text).
+# The range level is not a left-associative chain and is parsed by parse_range.
+_BINARY_LEVELS: Final = (
+    (frozenset({TokenType.OR}), '||'),
+    (frozenset({TokenType.AND}), '&&'),
+    (_EQ_OPS, None),
+    (_CMP_OPS, None),
+    None,
+    (_ADD_OPS, None),
+    (_MUL_OPS, None),
 )
+_RANGE_LEVEL: Final = 4
+
+# Characters that matter when finding the end of a native JS block
+_RAW_JS_STOP_RE: Final = re.compile(r'[{}"\']|//')
+# Rest of a JS string literal after the opening quote, up to the closing one
+_RAW_JS_STRING_RE: Final = {
+    '"': re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL),
+    "'": re.compile(r"[^'\\]*(?:\\.[^'\\]*)*'", re.DOTALL),
+}
 
 
 class ParseError(Exception):
-    def __init__(self, message: str, token: Token):
+    def __init__(self, message: str, token: Token) -> None:
         super().__init__(f"Parse error at {token.line}:{token.col}: {message}")
         self.token = token
 
 
 class Parser:
-    def __init__(self, tokens: list[Token], source: str, filename: str = "<stdin>"):
-        self.tokens = tokens
-        self.source = source
-        self.filename = filename
-        self.pos = 0
+    def __init__(self, tokens: list[Token], source: str, filename: str = "<stdin>") -> None:
+        self._setup(tuple(tok.type for tok in tokens), tuple(tok.value for tok in tokens),
+                    tuple(tok.pos for tok in tokens), tokens[-1].line_starts, source, filename)
+
+    @classmethod
+    def from_lexer(cls, lexer: Lexer, source: str) -> "Parser":
+        """Build a parser over the lexer's parallel token arrays, without
+        creating any Token objects."""
+        lexer.scan()
+        parser = cls.__new__(cls)
+        parser._setup(lexer.types, lexer.values, lexer.positions, lexer.line_starts,
+                      source, lexer.filename)
+        return parser
+
+    def _setup(self, types: tuple[TokenType, ...], values: tuple[object, ...],
+               positions: tuple[int, ...], line_starts: list[int],
+               source: str, filename: str) -> None:
+        # Tokens are stored as parallel, immutable arrays indexed by token
+        # number. They always end with EOF, and pos never moves past it.
+        self.types: tuple[TokenType, ...] = types
+        self.values: tuple[object, ...] = values
+        self.positions: tuple[int, ...] = positions
+        self.line_starts: list[int] = line_starts
+        self._last: int = len(types) - 1
+        self.source: str = source
+        self.filename: str = filename
+        self.pos: int = 0
+        self._identifiers: dict[str, Identifier] = {}
+        # Index of the matching ')' for each '(' token; see _build_paren_table()
+        self.paren_close: dict[int, int] = {}
+        # Token indices and source positions of '}' tokens, built on first use
+        self._rbrace_indices: list[int] | None = None
+        self._rbrace_positions: list[int] | None = None
+
+    def token(self, index: int) -> Token:
+        """Return a Token for the token at `index`, for error reporting."""
+        return Token(self.types[index], self.values[index], self.positions[index],
+                     self.line_starts)
 
     def error(self, msg: str) -> ParseError:
-        return ParseError(msg, self.current())
-
-    def current(self) -> Token:
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
-        return self.tokens[-1]  # EOF
-
-    def peek(self, offset: int = 0) -> Token:
-        p = self.pos + offset
-        if p < len(self.tokens):
-            return self.tokens[p]
-        return self.tokens[-1]
-
-    def advance(self) -> Token:
-        tok = self.current()
-        self.pos += 1
-        return tok
-
-    def expect(self, type: TokenType, msg: str = None) -> Token:
-        tok = self.current()
-        if tok.type != type:
+        return ParseError(msg, self.token(self.pos))
+
+    def make_identifier(self, name: str) -> Identifier:
+        """Return the shared Identifier node for `name` within this parse."""
+        node = self._identifiers.get(name)
+        if node is None:
+            node = self._identifiers[name] = Identifier(name)
+        return node
+
+    def peek(self, offset: int = 0) -> TokenType:
+        return self.types[min(self.pos + offset, self._last)]
+
+    def advance(self) -> object:
+        """Consume the current token and return its value."""
+        pos = self.pos
+        if pos < self._last:
+            self.pos = pos + 1
+        return self.values[pos]
+
+    def expect(self, type: TokenType, msg: str | None = None) -> object:
+        pos = self.pos
+        if self.types[pos] != type:
             expected = msg or type.name
-            raise self.error(f"Expected {expected}, got {tok.type.name} ({tok.value!r})")
+            raise self.error(f"Expected {expected}, got {self.types[pos].name} "
+                             f"({self.values[pos]!r})")
         return self.advance()
 
-    def match(self, *types: TokenType) -> Token | None:
-        if self.current().type in types:
-            return self.advance()
-        return None
-
-    def skip_newlines(self):
-        while self.current().type == TokenType.NEWLINE:
-            self.advance()
+    def _match1(self, type: TokenType) -> bool:
+        """Consume the current token if it has type `type`. `type` is never
+        EOF, so the token can be stepped over directly."""
+        pos = self.pos
+        if self.types[pos] == type:
+            self.pos = pos + 1
+            return True
+        return False
+
+    def skip_newlines(self) -> None:
+        # A NEWLINE is never the last token, so this cannot run past EOF
+        types = self.types
+        pos = self.pos
+        while types[pos] == TokenType.NEWLINE:
+            pos += 1
+        self.pos = pos
 
     def at_statement_end(self) -> bool:
-        return self.current().type in (TokenType.NEWLINE, TokenType.EOF, TokenType.RBRACE)
+        return self.types[self.pos] in _STMT_END
 
-    def expect_statement_end(self):
-        if self.current().type == TokenType.RBRACE or self.current().type == TokenType.EOF:
+    def expect_statement_end(self) -> None:
+        if self.types[self.pos] == TokenType.RBRACE or self.types[self.pos] == TokenType.EOF:
             return
-        if self.current().type == TokenType.NEWLINE:
+        if self.types[self.pos] == TokenType.NEWLINE:
             self.skip_newlines()
             return
-        raise self.error(f"Expected end of statement, got {self.current().type.name}")
+        raise self.error(f"Expected end of statement, got {self.types[self.pos].name}")
 
     # === Top-level parsing ===
 
+    def _build_paren_table(self) -> None:
+        """Pair up every '(' with its ')' in one pass over the tokens, so the
+        closure lookahead does not have to rescan parenthesized groups."""
+        paren_close = self.paren_close = {}
+        open_parens = []
+        for i, type in enumerate(self.types):
+            if type == TokenType.LPAREN:
+                open_parens.append(i)
+            elif type == TokenType.RPAREN and open_parens:
+                paren_close[open_parens.pop()] = i
+
     def parse_module(self, path: str = "__main__") -> Module:
+        self._build_paren_table()
         self.skip_newlines()
         stmts = []
-        while self.current().type != TokenType.EOF:
+        while self.types[self.pos] != TokenType.EOF:
             stmts.append(self.parse_statement())
             self.skip_newlines()
         return Module(path=path, statements=stmts)
 
-    def parse_statement(self):
-        tok = self.current()
-
-        if tok.type == TokenType.ADOPT:
-            return self.parse_adopt()
-        if tok.type == TokenType.SHARE:
-            return self.parse_share()
-        if tok.type == TokenType.KEEP:
-            return self.parse_keep(is_shared=False)
-        if tok.type == TokenType.IF:
-            return self.parse_if()
-        if tok.type == TokenType.STAY:
-            return self.parse_while()
-        if tok.type == TokenType.GO:
-            return self.parse_foreach()
-        if tok.type == TokenType.RETURN:
-            return self.parse_return()
+    def parse_statement(self) -> object:
+        handler = _STMT_DISPATCH.get(self.types[self.pos])
+        if handler is not None:
+            return handler(self)
+        return self.parse_expression_statement()
 
+    def parse_expression_statement(self) -> object:
         # Expression statement (could be assignment or function call)
         expr = self.parse_expression()
 
         # Check for assignment operators
-        if self.current().type in (TokenType.ASSIGN, TokenType.PLUS_ASSIGN,
-                                    TokenType.MINUS_ASSIGN, TokenType.STAR_ASSIGN,
-                                    TokenType.SLASH_ASSIGN):
-            op_tok = self.advance()
+        if self.types[self.pos] in _ASSIGN_OPS:
+            op = self.advance()
             value = self.parse_expression()
             self.expect_statement_end()
-            return Assignment(target=expr, op=op_tok.value, value=value)
+            return Assignment(target=expr, op=op, value=value)
 
         self.expect_statement_end()
         return ExpressionStatement(expr=expr)
@@ -116,39 +194,39 @@ class Parser:
 
     def parse_adopt(self) -> AdoptStatement:
         self.expect(TokenType.ADOPT)
-        parts = [self.expect(TokenType.IDENT).value]
-        while self.match(TokenType.DOT):
-            parts.append(self.expect(TokenType.IDENT).value)
+        parts = [self.expect(TokenType.IDENT)]
+        while self._match1(TokenType.DOT):
+            parts.append(self.expect(TokenType.IDENT))
         self.expect_statement_end()
-        return AdoptStatement(module_path=parts)
+        return AdoptStatement(module_path=tuple(parts))
 
     # === Variable declaration ===
 
-    def parse_share(self):
+    def parse_share(self) -> object:
         self.expect(TokenType.SHARE)
-        if self.current().type == TokenType.KEEP:
+        if self.types[self.pos] == TokenType.KEEP:
             return self.parse_keep(is_shared=True)
         raise self.error("Expected 'keep' after 'share'")
 
     def parse_keep(self, is_shared: bool) -> VariableDecl:
         self.expect(TokenType.KEEP)
-        name = self.expect(TokenType.IDENT).value
+        name = self.expect(TokenType.IDENT)
         type_ann = None
 
         # Optional type annotation
-        if self.current().type == TokenType.COLON:
+        if self.types[self.pos] == TokenType.COLON:
             self.advance()
-            if self.current().type == TokenType.NATIVE:
-                type_ann = self.advance().value
+            if self.types[self.pos] == TokenType.NATIVE:
+                type_ann = self.advance()
             else:
-                type_ann = self.expect(TokenType.IDENT).value
+                type_ann = self.expect(TokenType.IDENT)
             # If no = follows, it's just a typed declaration
-            if self.current().type != TokenType.ASSIGN:
+            if self.types[self.pos] != TokenType.ASSIGN:
                 self.expect_statement_end()
                 return VariableDecl(name=name, value=None, is_shared=is_shared, type_ann=type_ann)
 
         # Value assignment
-        if self.match(TokenType.ASSIGN):
+        if self._match1(TokenType.ASSIGN):
             value = self.parse_expression()
             # If it's a ClassDef, set its name
             if isinstance(value, ClassDef):
@@ -168,9 +246,9 @@ class Parser:
         elif_clauses = []
         else_body = None
 
-        while self.current().type == TokenType.ELSE:
+        while self.types[self.pos] == TokenType.ELSE:
             self.advance()
-            if self.current().type == TokenType.IF:
+            if self.types[self.pos] == TokenType.IF:
                 self.advance()
                 elif_cond = self.parse_expression()
                 elif_body = self.parse_block()
@@ -193,7 +271,7 @@ class Parser:
         self.expect(TokenType.GO)
         iterable = self.parse_expression()
         self.expect(TokenType.BY)
-        var_name = self.expect(TokenType.IDENT).value
+        var_name = self.expect(TokenType.IDENT)
         body = self.parse_block()
         return ForEachStatement(iterable=iterable, var_name=var_name, body=body)
 
@@ -213,8 +291,8 @@ class Parser:
         self.expect(TokenType.LBRACE)
         self.skip_newlines()
         stmts = []
-        while self.current().type != TokenType.RBRACE:
-            if self.current().type == TokenType.EOF:
+        while self.types[self.pos] != TokenType.RBRACE:
+            if self.types[self.pos] == TokenType.EOF:
                 raise self.error("Unexpected end of file, expected '}'")
             stmts.append(self.parse_statement())
             self.skip_newlines()
@@ -224,95 +302,78 @@ class Parser:
     # === Expressions (precedence climbing) ===
 
     def parse_expression(self) -> object:
-        return self.parse_or()
-
-    def parse_or(self):
-        left = self.parse_and()
-        while self.match(TokenType.OR):
-            right = self.parse_and()
-            left = BinaryOp(left=left, op='||', right=right)
-        return left
-
-    def parse_and(self):
-        left = self.parse_equality()
-        while self.match(TokenType.AND):
-            right = self.parse_equality()
-            left = BinaryOp(left=left, op='&&', right=right)
-        return left
-
-    def parse_equality(self):
-        left = self.parse_comparison()
-        while self.current().type in (TokenType.EQ, TokenType.NEQ):
-            op = self.advance().value
-            right = self.parse_comparison()
-            left = BinaryOp(left=left, op=op, right=right)
-        return left
-
-    def parse_comparison(self):
-        left = self.parse_range()
-        while self.current().type in (TokenType.LT, TokenType.GT, TokenType.LTE, TokenType.GTE):
-            op = self.advance().value
-            right = self.parse_range()
-            left = BinaryOp(left=left, op=op, right=right)
+        return self._parse_binary(0)
+
+    def _parse_binary(self, level: int) -> object:
+        """Parse a left-associative operator chain at `level` of
+        _BINARY_LEVELS, with the tighter-binding levels as operands."""
+        entry = _BINARY_LEVELS[level]
+        if entry is None:
+            return self.parse_range()
+        ops, op = entry
+        types = self.types
+        values = self.values
+        # The operand parsers move self.pos, so it is re-read once per
+        # iteration and the operator is consumed without advance()
+        if level + 1 < len(_BINARY_LEVELS):
+            left = self._parse_binary(level + 1)
+            while True:
+                pos = self.pos
+                if types[pos] not in ops:
+                    break
+                self.pos = pos + 1
+                right = self._parse_binary(level + 1)
+                left = BinaryOp(left, op or values[pos], right)
+        else:
+            left = self.parse_unary()
+            while True:
+                pos = self.pos
+                if types[pos] not in ops:
+                    break
+                self.pos = pos + 1
+                right = self.parse_unary()
+                left = BinaryOp(left, op or values[pos], right)
         return left
 
-    def parse_range(self):
-        left = self.parse_addition()
-        if self.current().type == TokenType.TO:
+    def parse_range(self) -> object:
+        left = self._parse_binary(_RANGE_LEVEL + 1)
+        if self.types[self.pos] == TokenType.TO:
             self.advance()
-            right = self.parse_addition()
+            right = self._parse_binary(_RANGE_LEVEL + 1)
             return RangeExpr(start=left, end=right)
         return left
 
-    def parse_addition(self):
-        left = self.parse_multiplication()
-        while self.current().type in (TokenType.PLUS, TokenType.MINUS):
-            op = self.advance().value
-            right = self.parse_multiplication()
-            left = BinaryOp(left=left, op=op, right=right)
-        return left
-
-    def parse_multiplication(self):
-        left = self.parse_unary()
-        while self.current().type in (TokenType.STAR, TokenType.SLASH, TokenType.PERCENT):
-            op = self.advance().value
-            right = self.parse_unary()
-            left = BinaryOp(left=left, op=op, right=right)
-        return left
-
-    def parse_unary(self):
-        if self.current().type == TokenType.BANG:
-            self.advance()
-            operand = self.parse_unary()
-            return UnaryOp(op='!', operand=operand)
-        if self.current().type == TokenType.MINUS:
-            self.advance()
+    def parse_unary(self) -> object:
+        if self.types[self.pos] in _UNARY_PREFIX:
+            op = self.advance()
             operand = self.parse_unary()
-            return UnaryOp(op='-', operand=operand)
+            return UnaryOp(op, operand)
         return self.parse_postfix()
 
-    def parse_postfix(self):
+    def parse_postfix(self) -> object:
         expr = self.parse_primary()
+        types = self.types
         while True:
-            if self.current().type == TokenType.LPAREN:
+            type = types[self.pos]
+            if type == TokenType.LPAREN:
                 # Function call
-                self.advance()
+                self.pos += 1
                 args = self.parse_args_list()
                 self.expect(TokenType.RPAREN)
-                expr = FunctionCall(callee=expr, args=args)
-            elif self.current().type == TokenType.DOT:
-                self.advance()
-                member = self.expect(TokenType.IDENT).value
-                expr = MemberAccess(object=expr, member=member)
-            elif self.current().type == TokenType.COLONCOLON:
-                self.advance()
-                member = self.expect(TokenType.IDENT).value
+                expr = FunctionCall(expr, args)
+            elif type == TokenType.DOT:
+                self.pos += 1
+                member = self.expect(TokenType.IDENT)
+                expr = MemberAccess(expr, member)
+            elif type == TokenType.COLONCOLON:
+                self.pos += 1
+                member = self.expect(TokenType.IDENT)
                 expr = ModuleAccess(object=expr, member=member)
-            elif self.current().type == TokenType.LBRACKET:
-                self.advance()
+            elif type == TokenType.LBRACKET:
+                self.pos += 1
                 index = self.parse_expression()
                 self.expect(TokenType.RBRACKET)
-                expr = IndexAccess(object=expr, index=index)
+                expr = IndexAccess(expr, index)
             else:
                 break
         return expr
@@ -320,80 +381,59 @@ class Parser:
     def parse_args_list(self) -> list:
         args = []
         self.skip_newlines()
-        if self.current().type == TokenType.RPAREN:
+        if self.types[self.pos] == TokenType.RPAREN:
             return args
         args.append(self.parse_expression())
-        while self.match(TokenType.COMMA):
+        while self._match1(TokenType.COMMA):
             self.skip_newlines()
             args.append(self.parse_expression())
         self.skip_newlines()
         return args
 
-    def parse_primary(self):
-        tok = self.current()
+    def parse_primary(self) -> object:
+        handler = _PRIMARY_DISPATCH.get(self.types[self.pos])
+        if handler is not None:
+            return handler(self)
+        raise self.error(f"Unexpected token: {self.types[self.pos].name} "
+                         f"({self.values[self.pos]!r})")
 
-        # Number literals
-        if tok.type == TokenType.INT:
-            self.advance()
-            return NumberLiteral(value=tok.value)
-        if tok.type == TokenType.FLOAT:
-            self.advance()
-            return NumberLiteral(value=tok.value)
+    def parse_int(self) -> IntLiteral:
+        return make_int(self.advance())
 
-        # String literal
-        if tok.type == TokenType.STRING:
-            self.advance()
-            return StringLiteral(value=tok.value)
+    def parse_float(self) -> FloatLiteral:
+        return FloatLiteral(value=self.advance())
 
-        # Boolean literals
-        if tok.type == TokenType.YES:
-            self.advance()
-            return BoolLiteral(value=True)
-        if tok.type == TokenType.NO:
-            self.advance()
-            return BoolLiteral(value=False)
+    def parse_string(self) -> StringLiteral:
+        return StringLiteral(value=self.advance())
+
+    def parse_yes(self) -> BoolLiteral:
+        self.advance()
+        return make_bool(True)
 
-        # Array literal
-        if tok.type == TokenType.LBRACKET:
-            return self.parse_array_literal()
+    def parse_no(self) -> BoolLiteral:
+        self.advance()
+        return make_bool(False)
 
-        # Makeout expression (constructor)
-        if tok.type == TokenType.MAKEOUT:
-            return self.parse_makeout()
+    def parse_identifier(self) -> Identifier:
+        return self.make_identifier(self.advance())
 
+    def parse_native(self) -> object:
         # Native block: native => { ... }
-        if tok.type == TokenType.NATIVE and self.peek(1).type == TokenType.ARROW:
+        if self.peek(1) == TokenType.ARROW:
             return self.parse_native_block()
-
-        # Boy (class definition)
-        if tok.type == TokenType.BOY:
-            return self.parse_class_def()
-
-        # Parenthesized expression or closure
-        if tok.type == TokenType.LPAREN:
-            return self.parse_paren_or_closure()
-
-        # Identifier
-        if tok.type == TokenType.IDENT:
-            self.advance()
-            return Identifier(name=tok.value)
-
         # Native as identifier (for type annotations used as values)
-        if tok.type == TokenType.NATIVE:
-            self.advance()
-            return Identifier(name='native')
-
-        raise self.error(f"Unexpected token: {tok.type.name} ({tok.value!r})")
+        self.advance()
+        return self.make_identifier('native')
 
     def parse_array_literal(self) -> ArrayLiteral:
         self.expect(TokenType.LBRACKET)
         elements = []
         self.skip_newlines()
-        if self.current().type != TokenType.RBRACKET:
+        if self.types[self.pos] != TokenType.RBRACKET:
             elements.append(self.parse_expression())
-            while self.match(TokenType.COMMA):
+            while self._match1(TokenType.COMMA):
                 self.skip_newlines()
-                if self.current().type == TokenType.RBRACKET:
+                if self.types[self.pos] == TokenType.RBRACKET:
                     break
                 elements.append(self.parse_expression())
         self.skip_newlines()
@@ -403,10 +443,10 @@ class Parser:
     def parse_makeout(self) -> MakeoutExpr:
         self.expect(TokenType.MAKEOUT)
         # Parse callee: could be simple ident or module path (a::b::C)
-        callee = Identifier(name=self.expect(TokenType.IDENT).value)
-        while self.current().type == TokenType.COLONCOLON:
+        callee = self.make_identifier(self.expect(TokenType.IDENT))
+        while self.types[self.pos] == TokenType.COLONCOLON:
             self.advance()
-            member = self.expect(TokenType.IDENT).value
+            member = self.expect(TokenType.IDENT)
             callee = ModuleAccess(object=callee, member=member)
         self.expect(TokenType.LPAREN)
         args = self.parse_args_list()
@@ -416,77 +456,93 @@ class Parser:
     def parse_native_block(self) -> NativeBlock:
         self.expect(TokenType.NATIVE)
         self.expect(TokenType.ARROW)
-        lbrace = self.expect(TokenType.LBRACE)
+        lbrace_pos = self.positions[self.pos]
+        self.expect(TokenType.LBRACE)
         # Extract raw JS from source between this { and matching }
-        raw = self._extract_raw_js(lbrace.pos)
+        raw = self._extract_raw_js(lbrace_pos)
         return NativeBlock(code=raw)
 
     def _extract_raw_js(self, lbrace_pos: int) -> str:
         """Extract raw JS code from source, consuming tokens until matching }."""
         # Find position in source after the {
         start = lbrace_pos + 1
+        source = self.source
+        n = len(source)
         depth = 1
         i = start
-        while i < len(self.source) and depth > 0:
-            ch = self.source[i]
+        # Jump between braces, quotes and comments instead of walking every character
+        search = _RAW_JS_STOP_RE.search
+        while depth > 0:
+            m = search(source, i)
+            if m is None:
+                i = n
+                break
+            i = m.start()
+            ch = source[i]
             if ch == '{':
                 depth += 1
+                i += 1
             elif ch == '}':
                 depth -= 1
-            elif ch == '"' or ch == "'":
-                # Skip string literals
-                quote = ch
                 i += 1
-                while i < len(self.source) and self.source[i] != quote:
-                    if self.source[i] == '\\':
-                        i += 1
-                    i += 1
-            elif ch == '/' and i + 1 < len(self.source) and self.source[i + 1] == '/':
+            elif ch == '/':
                 # Skip // comments
-                while i < len(self.source) and self.source[i] != '\n':
-                    i += 1
-                continue
-            i += 1
-
-        raw = self.source[start:i - 1]  # exclude closing }
-
-        # Advance parser past all tokens until we're past the closing }
-        while self.pos < len(self.tokens) and self.tokens[self.pos].type != TokenType.RBRACE:
-            self.pos += 1
-        # Find the RBRACE that corresponds to our closing position
-        # We need to skip inner braces
+                i = source.find('\n', i)
+                if i < 0:
+                    i = n
+            else:
+                # Skip string literals; an unterminated one runs to the end
+                m = _RAW_JS_STRING_RE[ch].match(source, i + 1)
+                if m is None:
+                    i = n + 1
+                    break
+                i = m.end()
+
+        raw = source[start:i - 1]  # exclude closing }
+
+        # Advance parser past the RBRACE token at (or after) the closing }
+        if self._rbrace_positions is None:
+            self._build_rbrace_table()
         target_pos = i - 1  # position of closing }
-        while self.pos < len(self.tokens):
-            if self.tokens[self.pos].type == TokenType.RBRACE and self.tokens[self.pos].pos >= target_pos:
-                self.advance()  # consume the }
-                break
-            self.pos += 1
+        k = bisect_left(self._rbrace_positions, target_pos)
+        if k < len(self._rbrace_indices):
+            self.pos = self._rbrace_indices[k]
+            self.advance()  # consume the }
+        else:
+            self.pos = self._last
 
         return raw
 
+    def _build_rbrace_table(self) -> None:
+        """Record the token index and source position of every '}' token, so
+        native blocks can find their closing token by bisection."""
+        types = self.types
+        self._rbrace_indices = [i for i in range(len(types)) if types[i] == TokenType.RBRACE]
+        self._rbrace_positions = [self.positions[i] for i in self._rbrace_indices]
+
     def parse_class_def(self) -> ClassDef:
         self.expect(TokenType.BOY)
         parent = None
-        if self.match(TokenType.COLON):
-            parent = self.expect(TokenType.IDENT).value
+        if self._match1(TokenType.COLON):
+            parent = self.expect(TokenType.IDENT)
         self.skip_newlines()
         self.expect(TokenType.LBRACE)
         self.skip_newlines()
         members = []
-        while self.current().type != TokenType.RBRACE:
-            if self.current().type == TokenType.EOF:
+        while self.types[self.pos] != TokenType.RBRACE:
+            if self.types[self.pos] == TokenType.EOF:
                 raise self.error("Unexpected end of file in class body")
-            if self.current().type == TokenType.SHARE:
+            if self.types[self.pos] == TokenType.SHARE:
                 members.append(self.parse_share())
-            elif self.current().type == TokenType.KEEP:
+            elif self.types[self.pos] == TokenType.KEEP:
                 members.append(self.parse_keep(is_shared=False))
             else:
-                raise self.error(f"Expected member declaration in class body, got {self.current().type.name}")
+                raise self.error(f"Expected member declaration in class body, got {self.types[self.pos].name}")
             self.skip_newlines()
         self.expect(TokenType.RBRACE)
         return ClassDef(name="", parent=parent, members=members)
 
-    def parse_paren_or_closure(self):
+    def parse_paren_or_closure(self) -> object:
         """Parse either a parenthesized expression or a closure definition."""
         # Save position for backtracking
         saved_pos = self.pos
@@ -506,29 +562,17 @@ class Parser:
 
     def _is_closure(self) -> bool:
         """Look ahead to determine if this is a closure (params) => ..."""
-        saved = self.pos
-        try:
-            if self.current().type != TokenType.LPAREN:
-                return False
-            self.advance()  # skip (
-            depth = 1
-            while depth > 0 and self.pos < len(self.tokens):
-                t = self.current().type
-                if t == TokenType.LPAREN:
-                    depth += 1
-                elif t == TokenType.RPAREN:
-                    depth -= 1
-                if depth > 0:
-                    self.advance()
-            if depth != 0:
-                return False
-            self.advance()  # skip closing )
-            # Check for =>
-            self.skip_newlines()
-            result = self.current().type == TokenType.ARROW
-            return result
-        finally:
-            self.pos = saved
+        if self.types[self.pos] != TokenType.LPAREN:
+            return False
+        close = self.paren_close.get(self.pos)
+        if close is None:
+            return False
+        # Check for => after the closing ), allowing newlines in between
+        types = self.types
+        p = close + 1
+        while types[p] == TokenType.NEWLINE:
+            p += 1
+        return types[p] == TokenType.ARROW
 
     def parse_closure(self) -> Closure:
         self.expect(TokenType.LPAREN)
@@ -538,7 +582,7 @@ class Parser:
         self.expect(TokenType.ARROW)
         self.skip_newlines()
 
-        if self.current().type == TokenType.LBRACE:
+        if self.types[self.pos] == TokenType.LBRACE:
             body = self.parse_block()
         else:
             # Single expression body
@@ -550,10 +594,10 @@ class Parser:
     def parse_params(self) -> list[Param]:
         params = []
         self.skip_newlines()
-        if self.current().type == TokenType.RPAREN:
+        if self.types[self.pos] == TokenType.RPAREN:
             return params
         params.append(self.parse_param())
-        while self.match(TokenType.COMMA):
+        while self._match1(TokenType.COMMA):
             self.skip_newlines()
             params.append(self.parse_param())
         self.skip_newlines()
@@ -561,31 +605,54 @@ class Parser:
 
     def parse_param(self) -> Param:
         self.skip_newlines()
-        name = self.expect(TokenType.IDENT).value
+        name = self.expect(TokenType.IDENT)
         type_ann = None
         is_vararg = False
 
         # Check for vararg: name...
-        if self.current().type == TokenType.DOTDOTDOT:
+        if self.types[self.pos] == TokenType.DOTDOTDOT:
             self.advance()
             is_vararg = True
 
         # Check for type annotation: name: type
-        if self.current().type == TokenType.COLON:
+        if self.types[self.pos] == TokenType.COLON:
             self.advance()
-            if self.current().type == TokenType.NATIVE:
-                type_ann = self.advance().value
+            if self.types[self.pos] == TokenType.NATIVE:
+                type_ann = self.advance()
             else:
-                type_ann = self.expect(TokenType.IDENT).value
-        elif self.current().type == TokenType.NATIVE:
+                type_ann = self.expect(TokenType.IDENT)
+        elif self.types[self.pos] == TokenType.NATIVE:
             # Handle : native where native is a keyword
             pass
 
         return Param(name=name, type_ann=type_ann, is_vararg=is_vararg)
 
 
+_STMT_DISPATCH: Final[dict[TokenType, Callable[[Parser], object]]] = {
+    TokenType.ADOPT: Parser.parse_adopt,
+    TokenType.SHARE: Parser.parse_share,
+    TokenType.KEEP: lambda parser: parser.parse_keep(is_shared=False),
+    TokenType.IF: Parser.parse_if,
+    TokenType.STAY: Parser.parse_while,
+    TokenType.GO: Parser.parse_foreach,
+    TokenType.RETURN: Parser.parse_return,
+}
+
+_PRIMARY_DISPATCH: Final[dict[TokenType, Callable[[Parser], object]]] = {
+    TokenType.INT: Parser.parse_int,
+    TokenType.FLOAT: Parser.parse_float,
+    TokenType.STRING: Parser.parse_string,
+    TokenType.YES: Parser.parse_yes,
+    TokenType.NO: Parser.parse_no,
+    TokenType.LBRACKET: Parser.parse_array_literal,
+    TokenType.MAKEOUT: Parser.parse_makeout,
+    TokenType.NATIVE: Parser.parse_native,
+    TokenType.BOY: Parser.parse_class_def,
+    TokenType.LPAREN: Parser.parse_paren_or_closure,
+    TokenType.IDENT: Parser.parse_identifier,
+}
+
+
 def parse(source: str, filename: str = "<stdin>") -> Module:
-    lexer = Lexer(source, filename)
-    tokens = lexer.tokenize()
-    parser = Parser(tokens, source, filename)
+    parser = Parser.from_lexer(Lexer(source, filename), source)
     return parser.parse_module()
@@ -55,13 +55,16 @@ STDLIB_MODULES = {
     },
 }
 
+# The JS line that defines each module, built once at import
+_STDLIB_PRELUDES = {
+    name: f"const {entry['js_name']} = {entry['js_def']};"
+    for name, entry in STDLIB_MODULES.items()
+}
+
 
 def is_stdlib(module_name: str) -> bool:
     return module_name in STDLIB_MODULES
 
 
 def get_stdlib_js(module_name: str) -> str | None:
-    entry = STDLIB_MODULES.get(module_name)
-    if entry:
-        return f"const {entry['js_name']} = {entry['js_def']};"
-    return None
+    return _STDLIB_PRELUDES.get(module_name)
@@ -1,7 +1,9 @@
-from enum import Enum, auto
+from bisect import bisect_right
+from enum import IntEnum, auto
+from typing import Final
 
 
-class TokenType(Enum):
+class TokenType(IntEnum):
     # Literals
     INT = auto()
     FLOAT = auto()
@@ -67,7 +69,7 @@ class TokenType(Enum):
     EOF = auto()
 
 
-KEYWORDS = {
+KEYWORDS: Final[dict[str, TokenType]] = {
     'adopt': TokenType.ADOPT,
     'keep': TokenType.KEEP,
     'share': TokenType.SHARE,
@@ -86,15 +88,69 @@ KEYWORDS = {
 }
 
 
+OPERATORS: Final[dict[str, TokenType]] = {
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.STAR,
+    '/': TokenType.SLASH,
+    '%': TokenType.PERCENT,
+    '=': TokenType.ASSIGN,
+    '==': TokenType.EQ,
+    '!=': TokenType.NEQ,
+    '<': TokenType.LT,
+    '>': TokenType.GT,
+    '<=': TokenType.LTE,
+    '>=': TokenType.GTE,
+    '+=': TokenType.PLUS_ASSIGN,
+    '-=': TokenType.MINUS_ASSIGN,
+    '*=': TokenType.STAR_ASSIGN,
+    '/=': TokenType.SLASH_ASSIGN,
+    '!': TokenType.BANG,
+    '&&': TokenType.AND,
+    '||': TokenType.OR,
+    '::': TokenType.COLONCOLON,
+    '=>': TokenType.ARROW,
+    '.': TokenType.DOT,
+    ':': TokenType.COLON,
+    '...': TokenType.DOTDOTDOT,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    '[': TokenType.LBRACKET,
+    ']': TokenType.RBRACKET,
+    ',': TokenType.COMMA,
+}
+
+
+def line_col(line_starts: list[int], pos: int) -> tuple[int, int]:
+    """Map a source offset to a 1-based (line, col) pair."""
+    line = bisect_right(line_starts, pos)
+    return line, pos - line_starts[line - 1] + 1
+
+
 class Token:
-    __slots__ = ('type', 'value', 'line', 'col', 'pos')
+    __slots__ = ('type', 'value', 'pos', 'line_starts')
+
+    type: TokenType
+    pos: int
+    line_starts: list[int]
 
-    def __init__(self, type: TokenType, value, line: int, col: int, pos: int):
+    def __init__(self, type: TokenType, value, pos: int, line_starts: list[int]) -> None:
         self.type = type
         self.value = value
-        self.line = line
-        self.col = col
         self.pos = pos
+        self.line_starts = line_starts
+
+    # Line and column are only needed for diagnostics, so they are computed
+    # from the lexer's line-start table instead of being stored.
+    @property
+    def line(self) -> int:
+        return bisect_right(self.line_starts, self.pos)
+
+    @property
+    def col(self) -> int:
+        return line_col(self.line_starts, self.pos)[1]
 
-    def __repr__(self):
-        return f"Token({self.type}, {self.value!r}, {self.line}:{self.col})"
+    def __repr__(self) -> str:
+        return f"Token(TokenType.{self.type.name}, {self.value!r}, {self.line}:{self.col})"
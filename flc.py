@@ -1,35 +1,35 @@
 #!/usr/bin/env python3
 """Femboy Language Compiler — compiles .fl files to JavaScript."""
 
+from __future__ import annotations
+
 import sys
 import os
-import argparse
-
-from fl.lexer import Lexer, LexerError
-from fl.parser import Parser, ParseError, parse
-from fl.codegen import CodeGen, CodeGenError
-from fl.stdlib import is_stdlib
-from fl.ast_nodes import (
-    AdoptStatement, Program, Module, VariableDecl, Assignment,
-    IfStatement, WhileStatement, ForEachStatement, ReturnStatement,
-    ExpressionStatement, Block, NumberLiteral, StringLiteral, BoolLiteral,
-    ArrayLiteral, Identifier, BinaryOp, UnaryOp, MemberAccess, ModuleAccess,
-    IndexAccess, FunctionCall, Closure, Param, RangeExpr, MakeoutExpr,
-    NativeBlock, ClassDef,
-)
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable
+
+# The compiler itself is imported where it is first used, so `flc --help`
+# and argument errors don't pay for loading it.
+if TYPE_CHECKING:
+    from fl.cache import ModuleCache
+    from fl.ast_nodes import (
+        AdoptStatement, Program, Module, VariableDecl, Assignment,
+        IfStatement, WhileStatement, ForEachStatement, ReturnStatement,
+        ExpressionStatement, Block, NumberLiteral, IntLiteral, FloatLiteral,
+        StringLiteral, BoolLiteral, ArrayLiteral, Identifier, BinaryOp, UnaryOp,
+        MemberAccess, ModuleAccess, IndexAccess, FunctionCall, Closure, Param,
+        RangeExpr, MakeoutExpr, NativeBlock, ClassDef,
+    )
 
 
 # === AST Pretty Printer ===
 
-# Box-drawing pieces
-_PIPE  = "\033[90m\u2502\033[0m"   # │
-_TEE   = "\033[90m\u251c\u2500\u2500\033[0m" # ├──
-_BEND  = "\033[90m\u2514\u2500\u2500\033[0m" # └──
-_BLANK = "   "
+# Colour only when writing to a terminal, and never when NO_COLOR is set
+_USE_ANSI = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
 
 # ANSI helpers
 def _c(code: int, text: str) -> str:
-    return f"\033[{code}m{text}\033[0m"
+    return f"\033[{code}m{text}\033[0m" if _USE_ANSI else text
 
 def _node(name: str) -> str:
     return _c(1, _c(36, name))          # bold cyan
@@ -46,175 +46,383 @@ def _dim(text: str) -> str:
 def _str(text: str) -> str:
     return _c(33, f'"{text}"')          # yellow quoted
 
+if _USE_ANSI:
+    # The same names and values get wrapped over and over, so remember the
+    # results. Without colour the helpers are near no-ops and not worth it.
+    _key = lru_cache(maxsize=4096)(_key)
+    _val = lru_cache(maxsize=4096)(_val)
+    _dim = lru_cache(maxsize=4096)(_dim)
+    _str = lru_cache(maxsize=4096)(_str)
+
+
+# Box-drawing pieces
+_PIPE  = _c(90, "\u2502")                 # │
+_TEE   = _c(90, "\u251c\u2500\u2500")     # ├──
+_BEND  = _c(90, "\u2514\u2500\u2500")     # └──
+_BLANK = "   "
+
+# Fixed labels, coloured once at import
+_LBL_PROGRAM = _node('Program')
+_LBL_MODULE = _node('Module')
+_LBL_ADOPT = _node('Adopt')
+_LBL_KEEP = _node('Keep')
+_LBL_ASSIGN = _node('Assign')
+_LBL_IF = _node('If')
+_LBL_STAY = _node('Stay')
+_LBL_GO = _node('Go')
+_LBL_RETURN = _node('Return')
+_LBL_BLOCK = _node('Block')
+_LBL_ARRAY = _node('Array')
+_LBL_BINOP = _node('BinOp')
+_LBL_UNARYOP = _node('UnaryOp')
+_LBL_MEMBER = _node('Member')
+_LBL_ACCESS = _node('Access')
+_LBL_INDEX = _node('Index')
+_LBL_CALL = _node('Call')
+_LBL_CLOSURE = _node('Closure')
+_LBL_RANGE = _node('Range')
+_LBL_MAKEOUT = _node('Makeout')
+_LBL_NATIVE = _node('Native')
+_LBL_BOY = _node('Boy')
+
+_DIM_BY = _dim('by')
+_DIM_TO = _dim('to')
+_DIM_DOT = _dim('.')
+_DIM_COLON = _dim(':')
+_DIM_COLONCOLON = _dim('::')
+_DIM_BRACES = _dim('{}')
+_DIM_BRACKETS = _dim('[]')
+_DIM_CONDITION = _dim('condition')
+_DIM_THEN = _dim('then')
+_DIM_ELSE_IF = _dim('else if')
+_DIM_ELSE = _dim('else')
+_SHARE = _c(35, "share")
+
+# Operator text as printed beside BinOp/UnaryOp/Assign, coloured once
+_OP_DIM = {op: _dim(op) for op in (
+    '+', '-', '*', '/', '%', '==', '!=', '<', '>', '<=', '>=', '&&', '||', '!',
+    '=', '+=', '-=', '*=', '/=',
+)}
+
+# Sink for printed lines; print_ast() collects them into a buffer
+_Emit = Callable[[str], object]
+
+# Prefix added below a child that has later siblings
+_CHILD_PIPE = f"{_PIPE}  "
+
 
 def print_ast(program: Program):
     """Pretty-print a Program AST as a coloured tree."""
-    print(_node("Program"))
+    # Lines are collected and written in one go rather than print()ed one by one
+    buf: list[str] = []
+    emit = buf.append
+    emit(f"{_LBL_PROGRAM}\n")
     modules = program.modules
+    last_idx = len(modules) - 1
     for i, mod in enumerate(modules):
-        last = i == len(modules) - 1
-        _print_module(mod, prefix="", is_last=last)
+        last = i == last_idx
+        _print_module(mod, "", last, emit)
+    sys.stdout.write("".join(buf))
 
 
-def _print_module(mod: Module, prefix: str, is_last: bool):
+def _print_module(mod: Module, prefix: str, is_last: bool, emit: _Emit):
     connector = _BEND if is_last else _TEE
-    child_prefix = prefix + (_BLANK if is_last else f"{_PIPE}  ")
+    child_prefix = prefix + (_BLANK if is_last else _CHILD_PIPE)
     label = _dim(mod.path) if mod.path == "__main__" else _val(mod.path)
-    print(f"{prefix}{connector} {_node('Module')} {label}")
+    emit(f"{prefix}{connector} {_LBL_MODULE} {label}\n")
     stmts = mod.statements
+    last_idx = len(stmts) - 1
     for i, stmt in enumerate(stmts):
-        _print_node(stmt, child_prefix, i == len(stmts) - 1)
+        _print_node(stmt, child_prefix, i == last_idx, emit)
+
+
+def _print_node(node, prefix: str, is_last: bool, emit: _Emit):
+    # Walks the subtree with an explicit stack instead of recursing. Node
+    # printers emit their own line and return what goes below it: child
+    # (node, prefix, is_last) entries and ready-made label lines, in order.
+    printers = _NODE_PRINTERS or _load_node_printers()
+    stack = [(node, prefix, is_last)]
+    pop = stack.pop
+    while stack:
+        item = pop()
+        if type(item) is str:
+            emit(item)
+            continue
+        node, prefix, is_last = item
+        connector = _BEND if is_last else _TEE
+        next_prefix = prefix + (_BLANK if is_last else _CHILD_PIPE)
+        handler = printers.get(type(node))
+        if handler is None:
+            emit(f"{prefix}{connector} {_dim(repr(node))}\n")
+            continue
+        children = handler(node, prefix, connector, next_prefix, emit)
+        if children:
+            stack.extend(reversed(children))
+
+
+# --- Statements ---
+
+def _print_expression_statement(node: ExpressionStatement, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    # Shown as the bare expression, in the statement's place
+    return [(node.expr, prefix, connector == _BEND)]
+
+
+def _print_adopt(node: AdoptStatement, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    path = _val(".".join(node.module_path))
+    emit(f"{prefix}{connector} {_LBL_ADOPT} {path}\n")
+
+
+def _print_keep(node: VariableDecl, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    mods = []
+    if node.is_shared:
+        mods.append(_SHARE)
+    tag = " ".join(mods)
+    if tag:
+        tag += " "
+    ann = f" {_dim(':' + node.type_ann)}" if node.type_ann else ""
+    emit(f"{prefix}{connector} {tag}{_LBL_KEEP} {_key(node.name)}{ann}\n")
+    if node.value is not None:
+        children.append((node.value, next_prefix, True))
+    return children
+
+
+def _print_assign(node: Assignment, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    op = node.op
+    emit(f"{prefix}{connector} {_LBL_ASSIGN} {_OP_DIM.get(op) or _dim(op)}\n")
+    children.append((node.target, next_prefix, False))
+    children.append((node.value, next_prefix, True))
+    return children
+
+
+def _add_labelled(children: list, next_prefix: str, label: str, child, is_last: bool):
+    # A dim label line with `child` hanging below it
+    if is_last:
+        children.append(f"{next_prefix}{_BEND} {label}\n")
+        children.append((child, next_prefix + _BLANK, True))
+    else:
+        children.append(f"{next_prefix}{_TEE} {label}\n")
+        children.append((child, next_prefix + _CHILD_PIPE, True))
 
 
-def _print_node(node, prefix: str, is_last: bool):
-    connector = _BEND if is_last else _TEE
-    next_prefix = prefix + (_BLANK if is_last else f"{_PIPE}  ")
-
-    # --- Statements ---
-    if isinstance(node, AdoptStatement):
-        path = _val(".".join(node.module_path))
-        print(f"{prefix}{connector} {_node('Adopt')} {path}")
-
-    elif isinstance(node, VariableDecl):
-        mods = []
-        if node.is_shared:
-            mods.append(_c(35, "share"))
-        tag = " ".join(mods)
-        if tag:
-            tag += " "
-        ann = f" {_dim(':' + node.type_ann)}" if node.type_ann else ""
-        print(f"{prefix}{connector} {tag}{_node('Keep')} {_key(node.name)}{ann}")
-        if node.value is not None:
-            _print_node(node.value, next_prefix, True)
-
-    elif isinstance(node, Assignment):
-        print(f"{prefix}{connector} {_node('Assign')} {_dim(node.op)}")
-        _print_node(node.target, next_prefix, False)
-        _print_node(node.value, next_prefix, True)
-
-    elif isinstance(node, IfStatement):
-        print(f"{prefix}{connector} {_node('If')}")
-        parts = []
-        parts.append(("condition", node.condition))
-        parts.append(("then", node.body))
-        for idx, (econd, ebody) in enumerate(node.elif_clauses):
-            parts.append((f"else if", econd))
-            parts.append((f"then", ebody))
-        if node.else_body:
-            parts.append(("else", node.else_body))
-        for i, (label, child) in enumerate(parts):
-            last = i == len(parts) - 1
-            c2 = _BEND if last else _TEE
-            np2 = next_prefix + (_BLANK if last else f"{_PIPE}  ")
-            print(f"{next_prefix}{c2} {_dim(label)}")
-            _print_node(child, np2, True)
-
-    elif isinstance(node, WhileStatement):
-        print(f"{prefix}{connector} {_node('Stay')}")
-        _print_node(node.condition, next_prefix, False)
-        _print_node(node.body, next_prefix, True)
-
-    elif isinstance(node, ForEachStatement):
-        print(f"{prefix}{connector} {_node('Go')} {_dim('by')} {_key(node.var_name)}")
-        _print_node(node.iterable, next_prefix, False)
-        _print_node(node.body, next_prefix, True)
-
-    elif isinstance(node, ReturnStatement):
-        print(f"{prefix}{connector} {_node('Return')}")
-        if node.value:
-            _print_node(node.value, next_prefix, True)
-
-    elif isinstance(node, ExpressionStatement):
-        _print_node(node.expr, prefix, is_last)
-
-    elif isinstance(node, Block):
-        stmts = node.statements
-        if not stmts:
-            print(f"{prefix}{connector} {_dim('{}')} ")
-            return
-        print(f"{prefix}{connector} {_node('Block')}")
-        for i, s in enumerate(stmts):
-            _print_node(s, next_prefix, i == len(stmts) - 1)
+def _print_if(node: IfStatement, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    emit(f"{prefix}{connector} {_LBL_IF}\n")
+    elifs = node.elif_clauses
+    else_body = node.else_body
+    _add_labelled(children, next_prefix, _DIM_CONDITION, node.condition, False)
+    _add_labelled(children, next_prefix, _DIM_THEN, node.body, not elifs and not else_body)
+    last_idx = len(elifs) - 1
+    for i, (econd, ebody) in enumerate(elifs):
+        _add_labelled(children, next_prefix, _DIM_ELSE_IF, econd, False)
+        _add_labelled(children, next_prefix, _DIM_THEN, ebody, i == last_idx and not else_body)
+    if else_body:
+        _add_labelled(children, next_prefix, _DIM_ELSE, else_body, True)
+    return children
 
-    # --- Expressions ---
-    elif isinstance(node, NumberLiteral):
-        print(f"{prefix}{connector} {_val(str(node.value))}")
 
-    elif isinstance(node, StringLiteral):
-        print(f"{prefix}{connector} {_str(node.value)}")
+def _print_stay(node: WhileStatement, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    emit(f"{prefix}{connector} {_LBL_STAY}\n")
+    children.append((node.condition, next_prefix, False))
+    children.append((node.body, next_prefix, True))
+    return children
 
-    elif isinstance(node, BoolLiteral):
-        print(f"{prefix}{connector} {_val('YES' if node.value else 'NO')}")
 
-    elif isinstance(node, ArrayLiteral):
-        if not node.elements:
-            print(f"{prefix}{connector} {_node('Array')} {_dim('[]')}")
-            return
-        print(f"{prefix}{connector} {_node('Array')}")
-        for i, el in enumerate(node.elements):
-            _print_node(el, next_prefix, i == len(node.elements) - 1)
-
-    elif isinstance(node, Identifier):
-        print(f"{prefix}{connector} {_key(node.name)}")
-
-    elif isinstance(node, BinaryOp):
-        print(f"{prefix}{connector} {_node('BinOp')} {_dim(node.op)}")
-        _print_node(node.left, next_prefix, False)
-        _print_node(node.right, next_prefix, True)
-
-    elif isinstance(node, UnaryOp):
-        print(f"{prefix}{connector} {_node('UnaryOp')} {_dim(node.op)}")
-        _print_node(node.operand, next_prefix, True)
-
-    elif isinstance(node, MemberAccess):
-        print(f"{prefix}{connector} {_node('Member')} {_dim('.')} {_key(node.member)}")
-        _print_node(node.object, next_prefix, True)
-
-    elif isinstance(node, ModuleAccess):
-        print(f"{prefix}{connector} {_node('Access')} {_dim('::')} {_key(node.member)}")
-        _print_node(node.object, next_prefix, True)
-
-    elif isinstance(node, IndexAccess):
-        print(f"{prefix}{connector} {_node('Index')}")
-        _print_node(node.object, next_prefix, False)
-        _print_node(node.index, next_prefix, True)
-
-    elif isinstance(node, FunctionCall):
-        print(f"{prefix}{connector} {_node('Call')}")
-        _print_node(node.callee, next_prefix, not node.args)
-        for i, arg in enumerate(node.args):
-            _print_node(arg, next_prefix, i == len(node.args) - 1)
-
-    elif isinstance(node, Closure):
-        params = ", ".join(_format_param(p) for p in node.params)
-        print(f"{prefix}{connector} {_node('Closure')} {_dim('('+ params +')')}")
-        _print_node(node.body, next_prefix, True)
-
-    elif isinstance(node, RangeExpr):
-        print(f"{prefix}{connector} {_node('Range')} {_dim('to')}")
-        _print_node(node.start, next_prefix, False)
-        _print_node(node.end, next_prefix, True)
-
-    elif isinstance(node, MakeoutExpr):
-        print(f"{prefix}{connector} {_node('Makeout')}")
-        _print_node(node.callee, next_prefix, not node.args)
-        for i, arg in enumerate(node.args):
-            _print_node(arg, next_prefix, i == len(node.args) - 1)
-
-    elif isinstance(node, NativeBlock):
-        preview = node.code.strip().replace('\n', ' ')
-        if len(preview) > 40:
-            preview = preview[:37] + "..."
-        print(f"{prefix}{connector} {_node('Native')} {_dim(preview)}")
-
-    elif isinstance(node, ClassDef):
-        parent = f" {_dim(':')} {_val(node.parent)}" if node.parent else ""
-        print(f"{prefix}{connector} {_node('Boy')}{parent}")
-        for i, m in enumerate(node.members):
-            _print_node(m, next_prefix, i == len(node.members) - 1)
+def _print_go(node: ForEachStatement, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    emit(f"{prefix}{connector} {_LBL_GO} {_DIM_BY} {_key(node.var_name)}\n")
+    children.append((node.iterable, next_prefix, False))
+    children.append((node.body, next_prefix, True))
+    return children
+
+
+def _print_return(node: ReturnStatement, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    emit(f"{prefix}{connector} {_LBL_RETURN}\n")
+    if node.value:
+        children.append((node.value, next_prefix, True))
+    return children
+
+
+def _print_block(node: Block, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    stmts = node.statements
+    if not stmts:
+        emit(f"{prefix}{connector} {_DIM_BRACES} \n")
+        return children
+    emit(f"{prefix}{connector} {_LBL_BLOCK}\n")
+    last_idx = len(stmts) - 1
+    for i, s in enumerate(stmts):
+        children.append((s, next_prefix, i == last_idx))
+    return children
+
+
+# --- Expressions ---
+
+def _print_number(node: NumberLiteral, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    emit(f"{prefix}{connector} {_val(str(node.value))}\n")
+
+
+def _print_string(node: StringLiteral, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    emit(f"{prefix}{connector} {_str(node.value)}\n")
+
+
+def _print_bool(node: BoolLiteral, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    emit(f"{prefix}{connector} {_val('YES' if node.value else 'NO')}\n")
+
+
+def _print_array(node: ArrayLiteral, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    if not node.elements:
+        emit(f"{prefix}{connector} {_LBL_ARRAY} {_DIM_BRACKETS}\n")
+        return children
+    emit(f"{prefix}{connector} {_LBL_ARRAY}\n")
+    last_idx = len(node.elements) - 1
+    for i, el in enumerate(node.elements):
+        children.append((el, next_prefix, i == last_idx))
+    return children
+
+
+def _print_identifier(node: Identifier, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    emit(f"{prefix}{connector} {_key(node.name)}\n")
+
+
+def _print_binop(node: BinaryOp, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    op = node.op
+    emit(f"{prefix}{connector} {_LBL_BINOP} {_OP_DIM.get(op) or _dim(op)}\n")
+    children.append((node.left, next_prefix, False))
+    children.append((node.right, next_prefix, True))
+    return children
 
-    else:
-        print(f"{prefix}{connector} {_dim(repr(node))}")
+
+def _print_unaryop(node: UnaryOp, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    op = node.op
+    emit(f"{prefix}{connector} {_LBL_UNARYOP} {_OP_DIM.get(op) or _dim(op)}\n")
+    children.append((node.operand, next_prefix, True))
+    return children
+
+
+def _print_member(node: MemberAccess, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    emit(f"{prefix}{connector} {_LBL_MEMBER} {_DIM_DOT} {_key(node.member)}\n")
+    children.append((node.object, next_prefix, True))
+    return children
+
+
+def _print_access(node: ModuleAccess, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    emit(f"{prefix}{connector} {_LBL_ACCESS} {_DIM_COLONCOLON} {_key(node.member)}\n")
+    children.append((node.object, next_prefix, True))
+    return children
+
+
+def _print_index(node: IndexAccess, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    emit(f"{prefix}{connector} {_LBL_INDEX}\n")
+    children.append((node.object, next_prefix, False))
+    children.append((node.index, next_prefix, True))
+    return children
+
+
+def _print_call(node: FunctionCall, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    emit(f"{prefix}{connector} {_LBL_CALL}\n")
+    children.append((node.callee, next_prefix, not node.args))
+    last_idx = len(node.args) - 1
+    for i, arg in enumerate(node.args):
+        children.append((arg, next_prefix, i == last_idx))
+    return children
+
+
+def _print_closure(node: Closure, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    params = ", ".join(_format_param(p) for p in node.params)
+    emit(f"{prefix}{connector} {_LBL_CLOSURE} {_dim('('+ params +')')}\n")
+    children.append((node.body, next_prefix, True))
+    return children
+
+
+def _print_range(node: RangeExpr, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    emit(f"{prefix}{connector} {_LBL_RANGE} {_DIM_TO}\n")
+    children.append((node.start, next_prefix, False))
+    children.append((node.end, next_prefix, True))
+    return children
+
+
+def _print_makeout(node: MakeoutExpr, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    emit(f"{prefix}{connector} {_LBL_MAKEOUT}\n")
+    children.append((node.callee, next_prefix, not node.args))
+    last_idx = len(node.args) - 1
+    for i, arg in enumerate(node.args):
+        children.append((arg, next_prefix, i == last_idx))
+    return children
+
+
+def _print_native(node: NativeBlock, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    preview = node.code.strip().replace('\n', ' ')
+    if len(preview) > 40:
+        preview = preview[:37] + "..."
+    emit(f"{prefix}{connector} {_LBL_NATIVE} {_dim(preview)}\n")
+
+
+def _print_boy(node: ClassDef, prefix: str, connector: str, next_prefix: str, emit: _Emit):
+    children = []
+    parent = f" {_DIM_COLON} {_val(node.parent)}" if node.parent else ""
+    emit(f"{prefix}{connector} {_LBL_BOY}{parent}\n")
+    last_idx = len(node.members) - 1
+    for i, m in enumerate(node.members):
+        children.append((m, next_prefix, i == last_idx))
+    return children
+
+
+# Printer for each node type, looked up by exact type. Filled on first use
+# so that importing flc doesn't load the AST classes.
+_NODE_PRINTERS: dict[type, Callable] = {}
+
+
+def _load_node_printers() -> dict[type, Callable]:
+    from fl.ast_nodes import (
+        AdoptStatement, VariableDecl, Assignment, IfStatement, WhileStatement,
+        ForEachStatement, ReturnStatement, ExpressionStatement, Block, IntLiteral, FloatLiteral,
+        StringLiteral, BoolLiteral, ArrayLiteral, Identifier, BinaryOp, UnaryOp,
+        MemberAccess, ModuleAccess, IndexAccess, FunctionCall, Closure,
+        RangeExpr, MakeoutExpr, NativeBlock, ClassDef,
+    )
+    _NODE_PRINTERS.update({
+        AdoptStatement: _print_adopt,
+        VariableDecl: _print_keep,
+        Assignment: _print_assign,
+        IfStatement: _print_if,
+        WhileStatement: _print_stay,
+        ForEachStatement: _print_go,
+        ReturnStatement: _print_return,
+        ExpressionStatement: _print_expression_statement,
+        Block: _print_block,
+        IntLiteral: _print_number,
+        FloatLiteral: _print_number,
+        StringLiteral: _print_string,
+        BoolLiteral: _print_bool,
+        ArrayLiteral: _print_array,
+        Identifier: _print_identifier,
+        BinaryOp: _print_binop,
+        UnaryOp: _print_unaryop,
+        MemberAccess: _print_member,
+        ModuleAccess: _print_access,
+        IndexAccess: _print_index,
+        FunctionCall: _print_call,
+        Closure: _print_closure,
+        RangeExpr: _print_range,
+        MakeoutExpr: _print_makeout,
+        NativeBlock: _print_native,
+        ClassDef: _print_boy,
+    })
+    return _NODE_PRINTERS
 
 
 def _format_param(p: Param) -> str:
@@ -228,26 +436,72 @@ def _format_param(p: Param) -> str:
 
 # === Module discovery ===
 
-def discover_modules(entry_path: str) -> list[tuple[str, str, str]]:
+def _read_source(path: str) -> str:
+    """Read a source file as text, with newlines normalised like open(path, 'r')."""
+    # One unbuffered read and a decode skip the text IO layers, which
+    # dominate the cost for files this small
+    with open(path, 'rb', buffering=0) as f:
+        source = f.read().decode('utf-8')
+    if '\r' in source:
+        source = source.replace('\r\n', '\n').replace('\r', '\n')
+    return source
+
+
+def discover_modules(entry_path: str,
+                     cache: ModuleCache | None = None) -> list[tuple[str, str, Module]]:
     """
     Starting from the entry file, discover all imported FL modules.
-    Returns list of (module_dotted_path, file_path, source) in dependency order.
+    Returns list of (module_dotted_path, file_path, parsed_module) in dependency order.
+    With a cache, modules found in it hold only their adopt statements and
+    their JS is in cache.hits.
     """
-    entry_dir = os.path.dirname(os.path.abspath(entry_path))
+    from fl.parser import parse
+    from fl.stdlib import is_stdlib
+    from fl.ast_nodes import AdoptStatement, Module
+
+    # Path lookups repeat for every adopt edge, so their results are cached
+    dir_cache: dict[str, str] = {}
+    exists_cache: dict[str, bool] = {}
+
+    def abs_dir(path: str) -> str:
+        d = dir_cache.get(path)
+        if d is None:
+            d = dir_cache[path] = os.path.dirname(os.path.abspath(path))
+        return d
+
+    def exists(path: str) -> bool:
+        found = exists_cache.get(path)
+        if found is None:
+            found = exists_cache[path] = os.path.exists(path)
+        return found
+
+    entry_dir = abs_dir(entry_path)
     visited = set()
     ordered = []
+    # Parsed statements per physical file. One file can be adopted under more
+    # than one dotted path, and each path needs its own module in the output.
+    parsed: dict[str, list] = {}
 
     def visit(dotted_path: str, file_path: str):
         if dotted_path in visited:
             return
         visited.add(dotted_path)
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            source = f.read()
-
-        # Parse to find adopt statements
-        module = parse(source, file_path)
-        mod_dir = os.path.dirname(os.path.abspath(file_path))
+        mod_dir = abs_dir(file_path)
+        real_path = os.path.realpath(file_path)
+        source = None
+        statements = None
+        if cache is not None:
+            source = _read_source(file_path)
+            statements = cache.lookup(dotted_path, source)
+        if statements is None:
+            statements = parsed.get(real_path)
+        if statements is None:
+            if source is None:
+                source = _read_source(file_path)
+            # Parse to find adopt statements; the result is also what gets compiled
+            statements = parsed[real_path] = parse(source, file_path).statements
+        module = Module(path=dotted_path, statements=statements, source_dir=mod_dir)
 
         for stmt in module.statements:
             if isinstance(stmt, AdoptStatement):
@@ -256,17 +510,17 @@ def discover_modules(entry_path: str) -> list[tuple[str, str, str]]:
                     continue
                 # Resolve relative path from the entry directory
                 rel_path = os.path.join(entry_dir, *imp_path) + '.fl'
-                if not os.path.exists(rel_path):
+                if not exists(rel_path):
                     # Try from current module's directory
                     rel_path = os.path.join(mod_dir, *imp_path) + '.fl'
-                if not os.path.exists(rel_path):
+                if not exists(rel_path):
                     print(f"Error: Cannot find module '{'.'.join(imp_path)}' "
                           f"(searched {entry_dir} and {mod_dir})",
                           file=sys.stderr)
                     sys.exit(1)
                 visit('.'.join(imp_path), rel_path)
 
-        ordered.append((dotted_path, file_path, source))
+        ordered.append((dotted_path, file_path, module))
 
     visit('__main__', entry_path)
     return ordered
@@ -275,22 +529,23 @@ def discover_modules(entry_path: str) -> list[tuple[str, str, str]]:
 # === Compilation ===
 
 def compile_file(entry_path: str, output_path: str | None = None,
-                 show_ast: bool = False):
+                 show_ast: bool = False, use_cache: bool = False):
     """Compile an FL file (and its dependencies) to a single JS file."""
+    from fl.codegen import CodeGen
+    from fl.ast_nodes import Program
+
     if not os.path.exists(entry_path):
         print(f"Error: File not found: {entry_path}", file=sys.stderr)
         sys.exit(1)
 
-    modules_info = discover_modules(entry_path)
-
-    # Parse all modules into AST
-    modules = []
-    for dotted_path, file_path, source in modules_info:
-        module = parse(source, file_path)
-        module.path = dotted_path
-        module.source_dir = os.path.dirname(os.path.abspath(file_path))
-        modules.append(module)
+    # Printing the AST needs every module parsed, so the cache is skipped then
+    cache = None
+    if use_cache and not show_ast:
+        from fl.cache import ModuleCache
+        cache = ModuleCache()
+    modules_info = discover_modules(entry_path, cache)
 
+    modules = [module for _, _, module in modules_info]
     program = Program(modules=modules)
 
     if show_ast:
@@ -299,32 +554,113 @@ def compile_file(entry_path: str, output_path: str | None = None,
 
     # Generate JS
     codegen = CodeGen()
-    js_output = codegen.generate_program(program)
-
-    # Write output
+    if cache is not None:
+        for module in modules:
+            js = cache.hits.get(module.path)
+            if js is None:
+                js = codegen.generate_bundled_module(module)
+                cache.store(module, js)
+            codegen.add_precompiled(module.path, js)
+        if cache.keys:
+            cache.prune()
+
+    # Write output, streaming each module's JS as it is generated
     if output_path is None:
         base = os.path.splitext(entry_path)[0]
         output_path = base + '.js'
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(js_output)
-        f.write('\n')
+    # Written beside the target and moved over it only once generation has
+    # finished, so a failure leaves any previous output untouched. A symlinked
+    # output is followed, so the file it points to is the one replaced.
+    target = os.path.realpath(output_path)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(codegen.generate_program_iter(program))
+            f.write('\n')
+        if os.path.exists(target):
+            import shutil
+            shutil.copymode(target, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
     print(f"Compiled {entry_path} -> {output_path}")
 
 
+_USAGE = "usage: flc [-h] [-o OUTPUT] [--ast] [--no-cache] input\n"
+
+_HELP = _USAGE + """
+Femboy Language Compiler — compiles .fl to JavaScript
+
+positional arguments:
+  input                 Input .fl file
+
+options:
+  -h, --help            show this help message and exit
+  -o OUTPUT, --output OUTPUT
+                        Output .js file (default: <input>.js)
+  --ast                 Print the AST tree
+  --no-cache            Regenerate every module instead of reusing cached JS
+"""
+
+
+def _usage_error(message: str):
+    sys.stderr.write(f"{_USAGE}flc: error: {message}\n")
+    sys.exit(2)
+
+
+def _parse_args(argv: list[str]) -> tuple[str, str | None, bool, bool]:
+    """Return (input, output, ast, no_cache) from the command line."""
+    # Scanned by hand: argparse costs more to import than compiling a small file
+    output = None
+    show_ast = False
+    no_cache = False
+    positional = []
+    extra = []
+    args = iter(argv)
+    for arg in args:
+        if arg in ('-h', '--help'):
+            sys.stdout.write(_HELP)
+            sys.exit(0)
+        elif arg in ('-o', '--output'):
+            output = next(args, None)
+            if output is None or output.startswith('-') and output != '-':
+                _usage_error("argument -o/--output: expected one argument")
+        elif arg.startswith('--output='):
+            output = arg[len('--output='):]
+        elif arg.startswith('-o') and not arg.startswith('--'):
+            output = arg[2:]
+        elif arg == '--ast':
+            show_ast = True
+        elif arg == '--no-cache':
+            no_cache = True
+        elif arg == '--':
+            positional.extend(args)
+        elif arg.startswith('-') and arg != '-':
+            extra.append(arg)
+        else:
+            positional.append(arg)
+    if not positional:
+        _usage_error("the following arguments are required: input")
+    extra.extend(positional[1:])
+    if extra:
+        _usage_error(f"unrecognized arguments: {' '.join(extra)}")
+    return positional[0], output, show_ast, no_cache
+
+
 def main():
-    parser = argparse.ArgumentParser(
-        description='Femboy Language Compiler — compiles .fl to JavaScript',
-        prog='flc',
-    )
-    parser.add_argument('input', help='Input .fl file')
-    parser.add_argument('-o', '--output', help='Output .js file (default: <input>.js)')
-    parser.add_argument('--ast', action='store_true', help='Print the AST tree')
-    args = parser.parse_args()
+    input_path, output, show_ast, no_cache = _parse_args(sys.argv[1:])
+
+    from fl.lexer import LexerError
+    from fl.parser import ParseError
+    from fl.codegen import CodeGenError
 
     try:
-        compile_file(args.input, args.output, show_ast=args.ast)
+        compile_file(input_path, output, show_ast=show_ast,
+                     use_cache=not no_cache)
     except LexerError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)